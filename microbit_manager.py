@@ -6,14 +6,53 @@ an interface to browse and copy .hex files from Downloads folder.
 """
 
 import os
+import re
 import sys
+import select
+import signal
 import subprocess
+import threading
 import time
 import glob
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from operator import itemgetter
 import curses
-import json
+
+import pyudev
+from inotify_simple import INotify, flags
+
+
+# Screen regions, redrawn only when flagged dirty
+HEADER = 1
+FILES = 2
+MB_FILES = 4
+INFO = 8
+CONTROLS = 16
+ALL_REGIONS = HEADER | FILES | MB_FILES | INFO | CONTROLS
+
+# File list row layout: name, size, modified
+_ROW_FMT = "{:<30} {:<10} {:<16}".format
+_ROW_HEADER = _ROW_FMT('Name', 'Size', 'Modified')
+
+# Every Intel HEX record starts with a colon
+_HEX_START = b':'
+
+# One or more Intel HEX records at the start of a file
+_HEX_RE = re.compile(rb'(?::[0-9A-Fa-f]{10,}(?:\r?\n|$))+')
+
+# Commonly useful DETAILS.TXT fields, e.g. "Interface Version: 0255"
+_DETAILS_RE = re.compile(
+    r'^[ \t]*(Interface Version|Bootloader Version|Unique ID|HIC ID|Daplink Mode|USB Interfaces|URL)'
+    r'[ \t]*:[ \t]*(.*?)[ \t\r]*$',
+    re.MULTILINE
+)
+
+
+def _fmt_mtime(ts, _strftime=time.strftime, _localtime=time.localtime):
+    """Format a file mtime for display."""
+    return _strftime('%Y-%m-%d %H:%M', _localtime(ts))
 
 
 class MicrobitManager:
@@ -21,6 +60,7 @@ class MicrobitManager:
         self.microbit_vendor_id = "0d28"
         self.microbit_product_id = "0204"
         self.mount_point = "/mnt/microbit"
+        self._mountinfo_needle = f" {self.mount_point} ".encode()
         
         # Handle Downloads directory when running with sudo
         if os.environ.get('SUDO_USER'):
@@ -32,33 +72,131 @@ class MicrobitManager:
         
         self.is_mounted = False
         self.microbit_device = None
+        self._status_expiry = 0.0
         self.status_message = ""
         self.selected_file_idx = 0
         self.manual_unmount = False  # Flag to prevent auto-mounting after manual unmount
         self.show_info_area = False  # Flag to show/hide firmware info area
         
-    def run_command(self, command, check=True, capture_output=True):
-        """Run a shell command and return the result."""
+        # Control instructions never change, so build them once
+        self._controls = (
+            "Controls:",
+            "↑/↓ or j/k - Navigate files",
+            "ENTER - Copy selected file to microbit",
+            "m - Mount/Unmount microbit",
+            "r - Refresh file list",
+            "i - Toggle firmware info area",
+            "q - Quit"
+        )
+        self._controls_attrs = (curses.A_BOLD,) + (curses.A_NORMAL,) * (len(self._controls) - 1)
+        
+        # USB connection state, kept up to date by udev events instead of polling lsusb
+        self._connected = False
+        self._device_info = None
+        self._microbit_sys_path = None
+        self._microbit_block_device = None
+        
+        # Cached file listings and DETAILS.TXT so redraws don't touch the filesystem;
+        # None means the cache is stale and is rebuilt on next access
+        self._hex_cache = None
+        self._mb_files_cache = None
+        self._details_parsed = None
+        
+        # Invalidation generations, bumped from the watcher threads. A cache entry is
+        # only fresh if nothing was invalidated while it was being built
+        self._generations = itertools.count(1)
+        self._hex_generation = 0
+        self._hex_cache_generation = None
+        self._mb_generation = 0
+        self._mb_files_cache_generation = None
+        
+        # Free bytes on the microbit, taken at mount time and updated after copies
+        self._fs_free = None
+        
+        # Last result of is_microbit_mounted(), refreshed after block udev events
+        # and our own mount/umount calls
+        self._mount_state = None
+        self._mountpoint_ready = False
+        
+        # Blocking mount/umount/copy work runs on one I/O thread so the UI stays
+        # responsive; only one operation is in flight at a time
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='microbit-io')
+        self._pending_op = None
+        self._pending_done = None
+        
+        # Auto-mount retry backoff while the device settles after plugging in
+        self._backoff = 0.5
+        self._next_mount_attempt = 0.0
+        
+        # Auto-unmount retry backoff while the unplugged microbit's mount is busy
+        self._unmount_backoff = 0.5
+        self._next_unmount_attempt = 0.0
+        
+        # Partial redraw state: dirty region flags (set from any thread) and the
+        # (start_y, end_y) rows each region occupied when it was last drawn
+        self._dirty = ALL_REGIONS
+        self._dirty_lock = threading.Lock()
+        self._layout = {}
+        self._drawn_lines = set()
+        self._pending_lines = []  # (y, x, text or None to just clear, attr) to write out
+        self._drawn_status = None
+        self._drawn_hex_files = None
+        
+        # Self-pipe used to wake the main loop on udev events and signals
+        self._wakeup_r, self._wakeup_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        
+        self._udev_ctx = pyudev.Context()
+        for device in self._udev_ctx.list_devices(subsystem='usb', DEVTYPE='usb_device'):
+            if self._is_microbit_usb_device(device):
+                self._set_connected(device)
+                break
+        for device in self._udev_ctx.list_devices(subsystem='block'):
+            if self._is_microbit_block_device(device):
+                self._microbit_block_device = device.device_node
+                break
+        
+        monitor = pyudev.Monitor.from_netlink(self._udev_ctx)
+        monitor.filter_by('usb', device_type='usb_device')
+        monitor.filter_by('block')
+        self._udev_observer = pyudev.MonitorObserver(
+            monitor,
+            callback=self._handle_udev_event,
+            name='microbit-udev'
+        )
+        self._udev_observer.start()
+        
+        # Watch Downloads for .hex changes instead of re-scanning it
+        self._downloads_inotify = INotify()
         try:
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=capture_output, 
-                text=True, 
-                check=check
+            self._downloads_inotify.add_watch(
+                str(self.downloads_dir),
+                flags.CREATE | flags.DELETE | flags.MOVED_TO | flags.MOVED_FROM | flags.MODIFY
             )
-            return result.stdout.strip() if capture_output else ""
-        except subprocess.CalledProcessError as e:
-            if capture_output:
-                return ""
-            return None
-    
-    def run_command_with_error(self, command):
-        """Run a command and return success status and error message."""
+        except OSError:
+            # No Downloads directory yet, the list is only rebuilt on 'r'
+            pass
+        else:
+            threading.Thread(
+                target=self._watch_downloads,
+                name='microbit-downloads',
+                daemon=True
+            ).start()
+        
+    @property
+    def status_message(self):
+        return self._status_message
+
+    @status_message.setter
+    def status_message(self, message):
+        # Messages are shown for two seconds, then cleared by draw_screen()
+        self._status_message = message
+        self._status_expiry = time.monotonic() + 2.0
+
+    def run_command_with_error(self, argv):
+        """Run a command (argument list, no shell) and return success status and error message."""
         try:
             result = subprocess.run(
-                command, 
-                shell=True, 
+                argv, 
                 capture_output=True, 
                 text=True, 
                 check=True
@@ -67,49 +205,167 @@ class MicrobitManager:
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr.strip() if e.stderr else f"Command failed with exit code {e.returncode}"
             return False, error_msg
+        except OSError as e:
+            return False, f"Cannot run {argv[0]}: {e.strerror or e}"
+
+    def _is_microbit_usb_device(self, device):
+        """Check whether a udev USB device is the microbit."""
+        return (device.get('ID_VENDOR_ID') == self.microbit_vendor_id and
+                device.get('ID_MODEL_ID') == self.microbit_product_id)
+
+    def _is_microbit_block_device(self, device):
+        """Check whether a udev block device is the microbit's mountable filesystem."""
+        # The microbit exposes its FAT filesystem directly on the disk, but accept
+        # a partition too as long as it carries a filesystem
+        if not device.get('ID_FS_TYPE'):
+            return False
+        usb_parent = device.find_parent('usb', 'usb_device')
+        return usb_parent is not None and self._is_microbit_usb_device(usb_parent)
+
+    def _reset_mount_backoff(self):
+        """Allow an immediate auto-mount attempt, e.g. after the device (re)appears."""
+        self._backoff = 0.5
+        self._next_mount_attempt = 0.0
+
+    def _set_connected(self, device):
+        """Record a connected microbit from its udev USB device."""
+        self._microbit_sys_path = device.sys_path
+        self._device_info = f"Bus {device.get('BUSNUM')} Device {device.get('DEVNUM')}"
+        self._connected = True
+
+    def _handle_udev_event(self, device):
+        """Update connection state from a udev event (runs on the observer thread)."""
+        if device.subsystem == 'block':
+            self._handle_block_event(device)
+            return
+        
+        if device.action == 'add' and self._is_microbit_usb_device(device):
+            self._set_connected(device)
+            self._reset_mount_backoff()
+        elif device.action == 'remove' and device.sys_path == self._microbit_sys_path:
+            # Remove events may lack ID_* properties, so match on the sysfs path
+            self._connected = False
+            self._device_info = None
+            self._microbit_sys_path = None
+        else:
+            return
+        self.invalidate_microbit_caches()
+        self.mark_dirty(HEADER | MB_FILES | INFO)
+        self._wake_main_loop()
+
+    def _handle_block_event(self, device):
+        """Track the microbit block device node as it appears and disappears."""
+        if device.action == 'add' and self._is_microbit_block_device(device):
+            self._microbit_block_device = device.device_node
+            self._reset_mount_backoff()
+        elif device.action == 'remove' and device.device_node == self._microbit_block_device:
+            self._microbit_block_device = None
+        else:
+            return
+        self._mount_state = None
+        self.invalidate_microbit_caches()
+        self.mark_dirty(HEADER | MB_FILES | INFO)
+        self._wake_main_loop()
+
+    def invalidate_microbit_caches(self):
+        """Drop cached microbit file listing, DETAILS.TXT contents and free space."""
+        self._mb_generation = next(self._generations)
+        self._mb_files_cache = None
+        self._details_parsed = None
+        self._fs_free = None
+
+    def invalidate_caches(self):
+        """Drop all cached file listings."""
+        self._hex_generation = next(self._generations)
+        self._hex_cache = None
+        self.invalidate_microbit_caches()
+
+    def _watch_downloads(self):
+        """Invalidate the hex file list when .hex files in Downloads change (runs on its own thread)."""
+        while True:
+            try:
+                events = self._downloads_inotify.read()
+            except OSError:
+                return
+            if any(event.name.endswith('.hex') for event in events):
+                self._hex_generation = next(self._generations)
+                self.mark_dirty(FILES)
+                self._wake_main_loop()
+
+    def start_io(self, func, on_done, label=None):
+        """Run a blocking operation returning (success, message) on the I/O thread.
+        
+        on_done(success, message) is called from the main loop once it finishes.
+        """
+        self._pending_op = self._io_pool.submit(func)
+        self._pending_done = on_done
+        self._pending_op.add_done_callback(lambda future: self._wake_main_loop())
+        if label:
+            self.status_message = f"[…] {label}"
+
+    def poll_io(self):
+        """Hand the result of a finished I/O operation to its callback."""
+        future = self._pending_op
+        if future is None or not future.done():
+            return
+        self._pending_op = None
+        try:
+            success, msg = future.result()
+        except Exception as e:
+            success, msg = False, str(e)
+        self._pending_done(success, msg)
+
+    def mark_dirty(self, regions):
+        """Flag screen regions for redraw (safe to call from any thread)."""
+        with self._dirty_lock:
+            self._dirty |= regions
+
+    def _take_dirty(self):
+        """Return and reset the dirty region flags."""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, 0
+        return dirty
+
+    def _wake_main_loop(self):
+        """Wake the main loop so it redraws."""
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except BlockingIOError:
+            # Pipe is full, so a wakeup is already pending
+            pass
 
     def detect_microbit(self):
         """Detect if microbit is connected via USB."""
-        lsusb_output = self.run_command("lsusb")
-        for line in lsusb_output.split('\n'):
-            if self.microbit_vendor_id in line and self.microbit_product_id in line:
-                # Extract device path
-                parts = line.split()
-                if len(parts) >= 4:
-                    bus = parts[1]
-                    device = parts[3].rstrip(':')
-                    return True, f"Bus {bus} Device {device}"
-        return False, None
+        return self._connected, self._device_info
+
+    def refresh_fs_free(self):
+        """Read the free space on the mounted microbit into the cache."""
+        try:
+            statvfs = os.statvfs(self.mount_point)
+            self._fs_free = statvfs.f_frsize * statvfs.f_bavail
+        except OSError:
+            self._fs_free = None
 
     def get_microbit_block_device(self):
         """Find the block device for the microbit."""
-        # Check for removable devices
-        lsblk_output = self.run_command("lsblk -J")
-        try:
-            data = json.loads(lsblk_output)
-            for device in data.get('blockdevices', []):
-                if device.get('rm', False):  # Removable device
-                    size = device.get('size', '')
-                    if '8.1M' in size or '8M' in size:  # Typical microbit size
-                        return f"/dev/{device['name']}"
-        except json.JSONDecodeError:
-            pass
-        
-        # Fallback: check common device names
-        for device in ['/dev/sda', '/dev/sdb', '/dev/sdc']:
-            if os.path.exists(device):
-                size_output = self.run_command(f"lsblk -b {device} | tail -1")
-                if size_output and '8' in size_output:  # Rough size check
-                    return device
-        return None
+        return self._microbit_block_device
 
     def is_microbit_mounted(self):
         """Check if microbit is currently mounted."""
-        mount_output = self.run_command("mount")
-        return self.mount_point in mount_output
+        if self._mount_state is None:
+            try:
+                with open('/proc/self/mountinfo', 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return False
+            # Mount points are space-delimited fields in mountinfo
+            self._mount_state = data.find(self._mountinfo_needle) != -1
+        return self._mount_state
 
     def mount_microbit(self):
         """Mount the microbit with comprehensive error handling."""
+        self.invalidate_microbit_caches()
+        
         device = self.get_microbit_block_device()
         if not device:
             return False, "No microbit block device found"
@@ -118,18 +374,24 @@ class MicrobitManager:
         if self.is_microbit_mounted():
             self.is_mounted = True
             self.microbit_device = device
+            self.refresh_fs_free()
             return True, f"Already mounted {device} to {self.mount_point}"
         
-        # Create mount point if it doesn't exist
-        success, result = self.run_command_with_error(f"sudo mkdir -p {self.mount_point}")
-        if not success:
-            return False, f"Failed to create mount point: {result}"
+        # Create mount point once, we already run as root
+        if not self._mountpoint_ready:
+            try:
+                os.makedirs(self.mount_point, exist_ok=True)
+            except OSError as e:
+                return False, f"Failed to create mount point: {e.strerror or e}"
+            self._mountpoint_ready = True
         
         # Mount the device
-        success, result = self.run_command_with_error(f"sudo mount {device} {self.mount_point}")
+        success, result = self.run_command_with_error(["mount", device, self.mount_point])
+        self._mount_state = None
         if success:
             self.is_mounted = True
             self.microbit_device = device
+            self.refresh_fs_free()
             return True, f"Mounted {device} to {self.mount_point}"
         else:
             # Parse common mount errors
@@ -137,6 +399,7 @@ class MicrobitManager:
             if "already mounted" in error_lower:
                 self.is_mounted = True
                 self.microbit_device = device
+                self.refresh_fs_free()
                 return True, f"Already mounted {device}"
             elif "permission denied" in error_lower:
                 return False, "Permission denied - run with sudo"
@@ -149,10 +412,13 @@ class MicrobitManager:
 
     def unmount_microbit(self):
         """Unmount the microbit with comprehensive error handling."""
+        self.invalidate_microbit_caches()
+        
         if not self.is_mounted and not self.is_microbit_mounted():
             return True, "Microbit not mounted"
         
-        success, result = self.run_command_with_error(f"sudo umount {self.mount_point}")
+        success, result = self.run_command_with_error(["umount", self.mount_point])
+        self._mount_state = None
         if success:
             self.is_mounted = False
             self.microbit_device = None
@@ -178,48 +444,92 @@ class MicrobitManager:
 
     def get_hex_files(self):
         """Get list of .hex files in Downloads directory."""
+        if self._hex_cache is not None and self._hex_cache_generation == self._hex_generation:
+            return self._hex_cache
+        
+        # Tag the result with the generation from before the scan, so an invalidation
+        # during the scan leaves it stale and it is rescanned on the next access
+        # (the watcher also wakes the main loop)
+        generation = self._hex_generation
+        hex_files = self._scan_hex_files()
+        self._hex_cache = hex_files
+        self._hex_cache_generation = generation
+        return self._hex_cache
+
+    def _scan_hex_files(self):
+        """Scan Downloads for .hex files, newest first."""
         hex_files = []
-        if self.downloads_dir.exists():
-            for hex_file in self.downloads_dir.glob("*.hex"):
-                stat = hex_file.stat()
-                hex_files.append({
-                    'name': hex_file.name,
-                    'path': str(hex_file),
-                    'size': stat.st_size,
-                    'mtime': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                })
-        return sorted(hex_files, key=lambda x: x['mtime'], reverse=True)
+        try:
+            # DirEntry caches the file type from readdir, so only one stat per file
+            with os.scandir(self.downloads_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.hex'):
+                        continue
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        # e.g. deleted between readdir and stat, skip it
+                        continue
+                    hex_files.append({
+                        'name': entry.name,
+                        'path': entry.path,
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime
+                    })
+        except OSError:
+            # Missing or unreadable Downloads directory, show no files
+            return []
+        hex_files.sort(key=itemgetter('mtime'), reverse=True)
+        return hex_files
     
-    def validate_hex_file(self, hex_file_path):
+    def read_hex_header(self, hex_file_path):
+        """Read the first block of a hex file for validation."""
+        fd = os.open(hex_file_path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            return os.read(fd, 4096)
+        finally:
+            os.close(fd)
+
+    def validate_hex_file(self, hex_file_path, buf=None):
         """Validate that a file appears to be a valid Intel HEX file."""
         try:
-            with open(hex_file_path, 'r') as f:
-                lines = f.readlines(100)  # Check first 100 lines
-                
-                if not lines:
-                    return False, "File is empty"
-                
-                # Check if it looks like an Intel HEX file
-                hex_line_count = 0
-                for line in lines[:10]:  # Check first 10 lines
-                    line = line.strip()
-                    if line.startswith(':') and len(line) >= 11:
-                        # Basic Intel HEX format check
-                        try:
-                            # Try to parse the hex data after the colon
-                            hex_data = line[1:]
-                            int(hex_data, 16)  # This will fail if not valid hex
-                            hex_line_count += 1
-                        except ValueError:
-                            continue
-                
-                if hex_line_count == 0:
-                    return False, "File does not appear to be in Intel HEX format"
-                
-                return True, "Valid HEX file"
-                
+            if buf is None:
+                buf = self.read_hex_header(hex_file_path)
         except Exception as e:
             return False, f"Cannot validate file: {str(e)}"
+        
+        if not buf:
+            return False, "File is empty"
+        
+        # Check if it looks like an Intel HEX file
+        if buf[:1] != _HEX_START or not _HEX_RE.match(buf):
+            return False, "File does not appear to be in Intel HEX format"
+        
+        return True, "Valid HEX file"
+
+    def sendfile_copy(self, src_path, dest_path):
+        """Copy a file in-kernel with sendfile and return success status and error message."""
+        try:
+            in_fd = os.open(src_path, os.O_RDONLY | os.O_CLOEXEC)
+            try:
+                out_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+                try:
+                    size = os.fstat(in_fd).st_size
+                    offset = 0
+                    while offset < size:
+                        sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                finally:
+                    os.close(out_fd)
+            finally:
+                os.close(in_fd)
+            return True, ""
+        except OSError as e:
+            return False, e.strerror or str(e)
 
     def copy_hex_file(self, hex_file_path):
         """Copy a hex file to the microbit with comprehensive error handling."""
@@ -233,20 +543,19 @@ class MicrobitManager:
         if not os.path.isfile(hex_file_path):
             return False, f"Source is not a file: {hex_file_path}"
         
-        # Validate that it's a proper HEX file
-        is_valid, validation_msg = self.validate_hex_file(hex_file_path)
-        if not is_valid:
-            return False, f"Invalid HEX file: {validation_msg}"
-        
         try:
-            with open(hex_file_path, 'r') as f:
-                # Try to read a small portion to verify it's accessible
-                f.read(100)
+            # Read the start of the file once, verifying it's accessible
+            buf = self.read_hex_header(hex_file_path)
         except PermissionError:
             return False, f"Permission denied reading source file"
         except Exception as e:
             return False, f"Cannot read source file: {str(e)}"
         
+        # Validate that it's a proper HEX file
+        is_valid, validation_msg = self.validate_hex_file(hex_file_path, buf)
+        if not is_valid:
+            return False, f"Invalid HEX file: {validation_msg}"
+        
         filename = os.path.basename(hex_file_path)
         dest_path = f"{self.mount_point}/{filename}"
         
@@ -254,20 +563,23 @@ class MicrobitManager:
         if not os.path.exists(self.mount_point):
             return False, "Mount point no longer exists - microbit may have been disconnected"
         
-        # Check available space on microbit (rough check)
+        # Re-flashing usually overwrites a file of the same name, which frees its space
         try:
-            statvfs = os.statvfs(self.mount_point)
-            free_bytes = statvfs.f_frsize * statvfs.f_bavail
-            file_size = os.path.getsize(hex_file_path)
-            
-            if free_bytes < file_size:
-                return False, f"Not enough space on microbit ({free_bytes} bytes free, need {file_size})"
-        except Exception:
-            # If we can't check space, continue anyway
-            pass
+            old_size = os.stat(dest_path).st_size
+        except FileNotFoundError:
+            old_size = 0
+        
+        # Check available space on microbit (rough check, cached since mount)
+        file_size = os.path.getsize(hex_file_path)
+        if self._fs_free is None:
+            self.refresh_fs_free()
+        free_bytes = self._fs_free
+        # If we can't check space, continue anyway
+        if free_bytes is not None and free_bytes + old_size < file_size:
+            return False, f"Not enough space on microbit ({free_bytes} bytes free, need {file_size})"
         
         # Perform the copy with detailed error reporting
-        success, result = self.run_command_with_error(f"sudo cp '{hex_file_path}' '{dest_path}'")
+        success, result = self.sendfile_copy(hex_file_path, dest_path)
         
         if success:
             # Verify the file was actually copied
@@ -280,6 +592,11 @@ class MicrobitManager:
                     if copied_size != original_size:
                         return False, f"Copy incomplete: {copied_size}/{original_size} bytes"
                     
+                    # Runs on the I/O thread, so invalidate by generation rather than
+                    # clearing the cache a main-thread rebuild could overwrite
+                    self._mb_generation = next(self._generations)
+                    if self._fs_free is not None:
+                        self._fs_free -= copied_size - old_size
                     return True, f"Successfully copied {filename} ({copied_size:,} bytes)"
                 except Exception as e:
                     return True, f"Copied {filename} (verification failed: {str(e)})"
@@ -304,92 +621,111 @@ class MicrobitManager:
         if not self.is_mounted or not os.path.exists(self.mount_point):
             return None
         
+        if self._mb_files_cache is not None and self._mb_files_cache_generation == self._mb_generation:
+            return self._mb_files_cache
+        
+        # A udev event during the scan leaves the result stale, so it is rescanned
+        # on the next access
+        generation = self._mb_generation
         try:
             files = []
-            for item in os.listdir(self.mount_point):
-                item_path = os.path.join(self.mount_point, item)
-                if os.path.isfile(item_path):
-                    try:
-                        stat = os.stat(item_path)
-                        files.append({
-                            'name': item,
-                            'size': stat.st_size,
-                            'mtime': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                        })
-                    except Exception:
-                        # If we can't get stats, still show the file
-                        files.append({
-                            'name': item,
-                            'size': 0,
-                            'mtime': 'unknown'
-                        })
-            return sorted(files, key=lambda x: x['name'])
+            with os.scandir(self.mount_point) as it:
+                for entry in it:
+                    if entry.is_file():
+                        try:
+                            stat = entry.stat()
+                            files.append({
+                                'name': entry.name,
+                                'size': stat.st_size,
+                                'mtime': stat.st_mtime
+                            })
+                        except Exception:
+                            # If we can't get stats, still show the file
+                            files.append({
+                                'name': entry.name,
+                                'size': 0,
+                                'mtime': None
+                            })
+            files.sort(key=itemgetter('name'))
+            self._mb_files_cache = files
+            self._mb_files_cache_generation = generation
+            return self._mb_files_cache
         except Exception:
             return None
 
-    def get_microbit_info(self):
-        """Get microbit information if mounted."""
+    def _parse_details(self):
+        """Parse DETAILS.TXT once per modification and return the cached result."""
         if not self.is_mounted:
             return None
         
         details_path = f"{self.mount_point}/DETAILS.TXT"
-        if os.path.exists(details_path):
-            try:
-                with open(details_path, 'r') as f:
-                    return f.read()
-            except Exception:
-                pass
-        return None
-
-    def get_firmware_version(self):
-        """Extract firmware version from DETAILS.TXT file."""
-        info = self.get_microbit_info()
-        if not info:
+        generation = self._mb_generation
+        try:
+            stat = os.stat(details_path)
+        except OSError:
             return None
         
-        # Parse DETAILS.TXT to find Interface Version
-        # Format: "Interface Version: 0255"
-        lines = info.split('\n')
+        # Only re-parse the file when it has been replaced or modified, or the
+        # microbit caches were invalidated (possibly while it was being parsed)
+        cached = self._details_parsed
+        if (cached is not None and cached['generation'] == self._mb_generation and
+                cached['ino'] == stat.st_ino and cached['mtime_ns'] == stat.st_mtime_ns):
+            return cached
         
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Interface Version:'):
-                parts = line.split(':', 1)
-                if len(parts) > 1:
-                    version = parts[1].strip()
-                    return version
+        try:
+            with open(details_path, 'r') as f:
+                info = f.read()
+        except Exception:
+            return None
+        
+        details = dict(_DETAILS_RE.findall(info))
         
-        return None
+        self._details_parsed = {
+            'version': details.get('Interface Version'),
+            'details': details,
+            'generation': generation,
+            'ino': stat.st_ino,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        return self._details_parsed
+
+    def get_firmware_version(self):
+        """Get firmware version from DETAILS.TXT file."""
+        parsed = self._parse_details()
+        return parsed['version'] if parsed else None
 
     def get_microbit_details(self):
-        """Extract key details from DETAILS.TXT for display."""
-        info = self.get_microbit_info()
-        if not info:
-            return {}
-        
-        details = {}
-        lines = info.split('\n')
-        
-        # Extract key fields that are commonly present
-        for line in lines:
-            line = line.strip()
-            if ':' in line and not line.startswith('#'):
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Store commonly useful fields
-                if key in ['Interface Version', 'Bootloader Version', 'Unique ID', 
-                          'HIC ID', 'Daplink Mode', 'USB Interfaces', 'URL']:
-                    details[key] = value
-        
-        return details
+        """Get key details from DETAILS.TXT for display."""
+        parsed = self._parse_details()
+        return parsed['details'] if parsed else {}
+
+    def draw_line(self, y, text, attr=curses.A_NORMAL, x=0):
+        """Queue text for a row, replacing whatever was left on it."""
+        self._pending_lines.append((y, x, text, attr))
+        self._drawn_lines.add(y)
+
+    def clear_lines(self, stdscr, start_y, end_y, keep=()):
+        """Queue clearing rows start_y..end_y-1 except those in keep."""
+        height, _ = stdscr.getmaxyx()
+        for y in range(start_y, min(end_y, height)):
+            if y not in keep:
+                self._pending_lines.append((y, 0, None, curses.A_NORMAL))
+
+    def flush_lines(self, stdscr):
+        """Write all queued rows to the screen in one pass."""
+        move, clrtoeol, addstr = stdscr.move, stdscr.clrtoeol, stdscr.addstr
+        for y, x, text, attr in self._pending_lines:
+            move(y, 0)
+            clrtoeol()
+            if text is not None:
+                addstr(y, x, text, attr)
+        self._pending_lines = []
 
     def draw_header(self, stdscr):
         """Draw the header of the TUI."""
         height, width = stdscr.getmaxyx()
         title = "=== MICROBIT MANAGER ==="
-        stdscr.addstr(0, (width - len(title)) // 2, title, curses.A_BOLD)
+        self.draw_line(0, title, curses.A_BOLD, (width - len(title)) // 2)
         
         # Status line with color coding
         connected, device_info = self.detect_microbit()
@@ -413,62 +749,49 @@ class MicrobitManager:
             if firmware_version:
                 status_line += f" | FW: {firmware_version}"
         
-        stdscr.addstr(1, 0, status_line[:width-1], color_attr)
+        self.draw_line(1, status_line[:width-1], color_attr)
         
         if self.status_message:
-            stdscr.addstr(2, 0, f"Status: {self.status_message}"[:width-1], curses.A_REVERSE)
+            self.draw_line(2, f"Status: {self.status_message}"[:width-1], curses.A_REVERSE)
             
         return 3 if self.status_message else 2
 
     def draw_controls(self, stdscr, start_y):
         """Draw control instructions."""
         height, width = stdscr.getmaxyx()
-        controls = [
-            "Controls:",
-            "↑/↓ or j/k - Navigate files",
-            "ENTER - Copy selected file to microbit",
-            "m - Mount/Unmount microbit",
-            "r - Refresh file list",
-            "i - Toggle firmware info area",
-            "q - Quit"
-        ]
         
-        for i, control in enumerate(controls):
+        for i, (control, attr) in enumerate(zip(self._controls, self._controls_attrs)):
             if start_y + i < height - 1:
-                attr = curses.A_BOLD if i == 0 else curses.A_NORMAL
-                stdscr.addstr(start_y + i, 0, control[:width-1], attr)
+                self.draw_line(start_y + i, control[:width-1], attr)
         
-        return start_y + len(controls)
+        return start_y + len(self._controls)
 
     def draw_file_list(self, stdscr, start_y, hex_files):
         """Draw the list of hex files."""
         height, width = stdscr.getmaxyx()
         
         if not hex_files:
-            stdscr.addstr(start_y, 0, "No .hex files found in Downloads folder", curses.A_DIM)
+            self.draw_line(start_y, "No .hex files found in Downloads folder", curses.A_DIM)
             return start_y + 2
         
-        stdscr.addstr(start_y, 0, f"Hex files in {self.downloads_dir}:", curses.A_BOLD)
+        self.draw_line(start_y, f"Hex files in {self.downloads_dir}:", curses.A_BOLD)
         start_y += 1
         
         # Header
-        header = f"{'Name':<30} {'Size':<10} {'Modified':<16}"
-        stdscr.addstr(start_y, 0, header[:width-1], curses.A_UNDERLINE)
+        self.draw_line(start_y, _ROW_HEADER[:width-1], curses.A_UNDERLINE)
         start_y += 1
         
-        # File list
-        for i, file_info in enumerate(hex_files):
-            if start_y + i >= height - 1:
-                break
-                
+        # File list (only rows that fit on screen are formatted)
+        visible = hex_files[:max(height - 1 - start_y, 0)]
+        for i, file_info in enumerate(visible):
             name = file_info['name'][:28]
             size = f"{file_info['size']:,}B"
-            mtime = file_info['mtime']
+            mtime = _fmt_mtime(file_info['mtime'])
             
-            line = f"{name:<30} {size:<10} {mtime:<16}"
+            line = _ROW_FMT(name, size, mtime)
             
             attr = curses.A_REVERSE if i == self.selected_file_idx else curses.A_NORMAL
-            stdscr.addstr(start_y + i, 0, line[:width-1], attr)
+            self.draw_line(start_y + i, line[:width-1], attr)
         
         return start_y + len(hex_files)
     
@@ -476,22 +799,21 @@ class MicrobitManager:
         """Draw the list of files on the microbit."""
         height, width = stdscr.getmaxyx()
         
-        stdscr.addstr(start_y, 0, "Files on microbit:", curses.A_BOLD)
+        self.draw_line(start_y, "Files on microbit:", curses.A_BOLD)
         start_y += 1
         
         microbit_files = self.get_microbit_files()
         
         if microbit_files is None:
-            stdscr.addstr(start_y, 0, "Not mounted", curses.color_pair(1) | curses.A_BOLD)  # Red
+            self.draw_line(start_y, "Not mounted", curses.color_pair(1) | curses.A_BOLD)  # Red
             return start_y + 2
         
         if not microbit_files:
-            stdscr.addstr(start_y, 0, "No files found on microbit", curses.A_DIM)
+            self.draw_line(start_y, "No files found on microbit", curses.A_DIM)
             return start_y + 2
         
         # Header
-        header = f"{'Name':<30} {'Size':<10} {'Modified':<16}"
-        stdscr.addstr(start_y, 0, header[:width-1], curses.A_UNDERLINE)
+        self.draw_line(start_y, _ROW_HEADER[:width-1], curses.A_UNDERLINE)
         start_y += 1
         
         # File list (limit to prevent screen overflow)
@@ -503,10 +825,13 @@ class MicrobitManager:
             file_info = microbit_files[i]
             name = file_info['name'][:28]
             size = f"{file_info['size']:,}B" if file_info['size'] > 0 else "unknown"
-            mtime = file_info['mtime']
+            if file_info['mtime'] is not None:
+                mtime = _fmt_mtime(file_info['mtime'])
+            else:
+                mtime = 'unknown'
             
-            line = f"{name:<30} {size:<10} {mtime:<16}"
-            stdscr.addstr(start_y + i, 0, line[:width-1], curses.A_NORMAL)
+            line = _ROW_FMT(name, size, mtime)
+            self.draw_line(start_y + i, line[:width-1], curses.A_NORMAL)
         
         return start_y + max_files
 
@@ -519,12 +844,12 @@ class MicrobitManager:
         
         details = self.get_microbit_details()
         if not details:
-            stdscr.addstr(start_y, 0, "--- FIRMWARE INFO ---", curses.A_BOLD)
-            stdscr.addstr(start_y + 1, 0, "Could not read microbit info", curses.color_pair(1))
+            self.draw_line(start_y, "--- FIRMWARE INFO ---", curses.A_BOLD)
+            self.draw_line(start_y + 1, "Could not read microbit info", curses.color_pair(1))
             return start_y + 2
         
         # Draw separator
-        stdscr.addstr(start_y, 0, "--- FIRMWARE INFO ---", curses.A_BOLD)
+        self.draw_line(start_y, "--- FIRMWARE INFO ---", curses.A_BOLD)
         y = start_y + 1
         
         # Display key firmware information in a compact format
@@ -553,17 +878,144 @@ class MicrobitManager:
         # Display info lines, wrapping if necessary
         for line in info_lines:
             if y < height - 1:
-                stdscr.addstr(y, 0, line[:width-1], curses.A_NORMAL)
+                self.draw_line(y, line[:width-1], curses.A_NORMAL)
                 y += 1
             else:
                 break
         
         return y
 
+    def wait_for_key(self, stdscr):
+        """Block until a key is pressed or the main loop is woken up.
+        
+        Returns -1 when woken by a udev event or a signal rather than a key.
+        """
+        key = stdscr.getch()
+        if key != -1:
+            return key
+        
+        # Wake up for the next auto-mount/unmount retry or status message expiry if
+        # one is pending, otherwise sleep until there is input, a udev event or a
+        # signal (e.g. terminal resize)
+        deadlines = []
+        if self._pending_op is None:
+            connected, _ = self.detect_microbit()
+            if connected and not self.is_mounted and not self.manual_unmount:
+                deadlines.append(self._next_mount_attempt)
+            elif not connected and self.is_mounted:
+                deadlines.append(self._next_unmount_attempt)
+            if self.status_message:
+                deadlines.append(self._status_expiry)
+        timeout = max(min(deadlines) - time.monotonic(), 0.0) if deadlines else None
+        readable, _, _ = select.select([sys.stdin, self._wakeup_r], [], [], timeout)
+        
+        if self._wakeup_r in readable:
+            try:
+                data = os.read(self._wakeup_r, 4096)
+            except BlockingIOError:
+                data = b''
+            if signal.SIGWINCH in data:
+                lines, cols = os.get_terminal_size(sys.__stdout__.fileno())
+                curses.resizeterm(lines, cols)
+                self.force_full_redraw(stdscr)
+        
+        return stdscr.getch()
+
+    def force_full_redraw(self, stdscr):
+        """Repaint the whole screen on the next draw, e.g. after a resize."""
+        stdscr.clear()
+        self._layout = {}
+        self.mark_dirty(ALL_REGIONS)
+
+    def draw_screen(self, stdscr, hex_files):
+        """Redraw only the dirty (or moved) regions and push the changes in one update."""
+        # Keep the progress message up while an operation is running
+        if (self.status_message and self._pending_op is None and
+                time.monotonic() >= self._status_expiry):
+            self.status_message = ""
+        if self.status_message != self._drawn_status:
+            self.mark_dirty(HEADER)
+            self._drawn_status = self.status_message
+        dirty = self._take_dirty()
+        
+        # (region, draw function returning the row after its content, blank rows after it)
+        sections = (
+            (HEADER, lambda y: self.draw_header(stdscr), 1),
+            (FILES, lambda y: self.draw_file_list(stdscr, y, hex_files), 1),
+            (MB_FILES, lambda y: self.draw_microbit_files(stdscr, y), 1),
+            (INFO, lambda y: self.draw_info_area(stdscr, y), 1 if self.show_info_area else 0),
+            (CONTROLS, lambda y: self.draw_controls(stdscr, y), 0),
+        )
+        
+        y_pos = 0
+        for region, draw, spacing in sections:
+            previous = self._layout.get(region)
+            if not dirty & region and previous is not None and previous[0] == y_pos:
+                # Untouched region in the same place, keep what's on screen
+                y_pos = previous[1]
+                continue
+            
+            self._drawn_lines = set()
+            end_y = draw(y_pos) + spacing
+            # Clear leftovers from this region's previous, possibly larger, extent
+            old_end_y = previous[1] if previous is not None else end_y
+            self.clear_lines(stdscr, y_pos, max(end_y, old_end_y), keep=self._drawn_lines)
+            self._layout[region] = (y_pos, end_y)
+            y_pos = end_y
+        
+        self.flush_lines(stdscr)
+        stdscr.noutrefresh()
+        curses.doupdate()
+
+    def _auto_mount_done(self, success, msg):
+        if success:
+            self._reset_mount_backoff()
+            self.status_message = msg
+        else:
+            self._next_mount_attempt = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, 30.0)
+            # Failures while the device settles stay quiet, just drop the progress message
+            if self.status_message == "[…] Mounting microbit":
+                self.status_message = ""
+        self.mark_dirty(HEADER | MB_FILES | INFO)
+
+    def _auto_unmount_done(self, success, msg):
+        if success:
+            self._unmount_backoff = 0.5
+            self._next_unmount_attempt = 0.0
+            self.manual_unmount = False  # Reset flag when disconnected
+            self.status_message = "Microbit disconnected and unmounted"
+        else:
+            # e.g. the mount is still busy, retry later instead of straight away
+            self._next_unmount_attempt = time.monotonic() + self._unmount_backoff
+            self._unmount_backoff = min(self._unmount_backoff * 2, 30.0)
+            self.status_message = msg
+        self.mark_dirty(HEADER | MB_FILES | INFO)
+
+    def _copy_done(self, success, msg):
+        self.status_message = msg
+        self.mark_dirty(MB_FILES)
+
+    def _manual_mount_done(self, success, msg):
+        if success:
+            self.manual_unmount = False  # Clear flag when manually mounting
+        self.status_message = msg
+        self.mark_dirty(HEADER | MB_FILES | INFO)
+
+    def _manual_unmount_done(self, success, msg):
+        if success:
+            self.manual_unmount = True  # Set flag to prevent auto-mounting
+        self.status_message = msg
+        self.mark_dirty(HEADER | MB_FILES | INFO)
+
     def main_loop(self, stdscr):
         """Main TUI loop."""
         curses.curs_set(0)  # Hide cursor
-        stdscr.timeout(1000)  # 1 second timeout for getch()
+        stdscr.nodelay(True)  # getch() never blocks, wait_for_key() does the waiting
+        
+        # Route SIGWINCH through the wakeup pipe so resizes interrupt select()
+        signal.signal(signal.SIGWINCH, lambda signum, frame: None)
+        signal.set_wakeup_fd(self._wakeup_w)
         
         # Initialize colors
         curses.start_color()
@@ -571,31 +1023,35 @@ class MicrobitManager:
         curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Green text
         
         while True:
-            stdscr.clear()
-            height, width = stdscr.getmaxyx()
-            
-            # Draw header
-            y_pos = self.draw_header(stdscr)
-            y_pos += 1
+            # Pick up the result of a finished mount/unmount/copy
+            self.poll_io()
             
             # Check microbit status
             connected, _ = self.detect_microbit()
-            if connected and not self.is_mounted and not self.manual_unmount:
-                # Auto-mount if connected but not mounted (unless manually unmounted)
-                success, msg = self.mount_microbit()
-                if success:
-                    self.status_message = msg
+            if self._pending_op is not None:
+                # Wait for the running operation before changing mount state
+                pass
+            elif connected and not self.is_mounted and not self.manual_unmount:
+                # Auto-mount if connected but not mounted (unless manually unmounted),
+                # backing off while the device is still settling
+                if time.monotonic() >= self._next_mount_attempt:
+                    self.start_io(self.mount_microbit, self._auto_mount_done, "Mounting microbit")
             elif not connected and self.is_mounted:
-                # Auto-unmount if disconnected and reset manual unmount flag
-                self.unmount_microbit()
-                self.manual_unmount = False  # Reset flag when disconnected
-                self.status_message = "Microbit disconnected and unmounted"
+                # Auto-unmount if disconnected and reset manual unmount flag,
+                # backing off if the mount is busy
+                if time.monotonic() >= self._next_unmount_attempt:
+                    # Only show progress on the first attempt, not on every retry
+                    label = "Unmounting microbit" if self._next_unmount_attempt == 0.0 else None
+                    self.start_io(self.unmount_microbit, self._auto_unmount_done, label)
             elif not connected:
                 # Reset manual unmount flag when disconnected
                 self.manual_unmount = False
             
-            # Get hex files
+            # Get hex files, the cached list is only replaced when Downloads changed
             hex_files = self.get_hex_files()
+            if hex_files is not self._drawn_hex_files:
+                self._drawn_hex_files = hex_files
+                self.mark_dirty(FILES)
             
             # Adjust selected index if necessary
             if hex_files:
@@ -603,66 +1059,55 @@ class MicrobitManager:
             else:
                 self.selected_file_idx = 0
             
-            # Draw file list
-            y_pos = self.draw_file_list(stdscr, y_pos, hex_files)
-            y_pos += 1
-            
-            # Draw microbit files
-            y_pos = self.draw_microbit_files(stdscr, y_pos)
-            y_pos += 1
-            
-            # Draw firmware info area if enabled
-            y_pos = self.draw_info_area(stdscr, y_pos)
-            if self.show_info_area:
-                y_pos += 1
-            
-            # Draw controls
-            self.draw_controls(stdscr, y_pos)
-            
-            stdscr.refresh()
+            self.draw_screen(stdscr, hex_files)
             
             # Handle input
-            key = stdscr.getch()
+            key = self.wait_for_key(stdscr)
             
             if key == ord('q'):
                 break
+            elif key == curses.KEY_RESIZE:
+                self.force_full_redraw(stdscr)
             elif key == curses.KEY_UP or key == ord('k'):
                 if hex_files and self.selected_file_idx > 0:
                     self.selected_file_idx -= 1
+                    self.mark_dirty(FILES)
             elif key == curses.KEY_DOWN or key == ord('j'):
                 if hex_files and self.selected_file_idx < len(hex_files) - 1:
                     self.selected_file_idx += 1
+                    self.mark_dirty(FILES)
             elif key == ord('\n') or key == curses.KEY_ENTER or key == 10:
-                if hex_files and self.is_mounted:
+                if self._pending_op is not None:
+                    self.status_message = "[…] Busy - please wait"
+                elif hex_files and self.is_mounted:
                     selected_file = hex_files[self.selected_file_idx]
-                    success, msg = self.copy_hex_file(selected_file['path'])
-                    self.status_message = msg
+                    self.start_io(
+                        lambda path=selected_file['path']: self.copy_hex_file(path),
+                        self._copy_done,
+                        f"Copying {selected_file['name']}"
+                    )
                 elif not self.is_mounted:
                     self.status_message = "Microbit not mounted - press 'm' to mount"
                 else:
                     self.status_message = "No hex files to copy"
             elif key == ord('m'):
-                if self.is_mounted:
-                    success, msg = self.unmount_microbit()
-                    if success:
-                        self.manual_unmount = True  # Set flag to prevent auto-mounting
+                if self._pending_op is not None:
+                    self.status_message = "[…] Busy - please wait"
+                elif self.is_mounted:
+                    self.start_io(self.unmount_microbit, self._manual_unmount_done, "Unmounting microbit")
                 else:
-                    success, msg = self.mount_microbit()
-                    if success:
-                        self.manual_unmount = False  # Clear flag when manually mounting
-                self.status_message = msg
+                    self.start_io(self.mount_microbit, self._manual_mount_done, "Mounting microbit")
             elif key == ord('r'):
+                self.invalidate_caches()
                 self.status_message = "File list refreshed"
+                self.mark_dirty(HEADER | FILES | MB_FILES | INFO)
             elif key == ord('i'):
                 if self.is_mounted:
                     self.show_info_area = not self.show_info_area  # Toggle info area
+                    self.mark_dirty(INFO)
                     self.status_message = f"Firmware info {'shown' if self.show_info_area else 'hidden'}"
                 else:
                     self.status_message = "Microbit not mounted"
-            
-            # Clear status message after a while
-            if self.status_message:
-                time.sleep(0.1)  # Brief pause to show message
 
     def run(self):
         """Run the TUI application."""
@@ -671,6 +1116,10 @@ class MicrobitManager:
         except KeyboardInterrupt:
             print("\nExiting...")
         finally:
+            self._udev_observer.stop()
+            # Let a running mount/copy finish before cleaning up
+            self._io_pool.shutdown(wait=True)
+            
             # Clean up: unmount if mounted
             if self.is_mounted:
                 self.unmount_microbit()